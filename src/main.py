@@ -10,7 +10,7 @@ from typing import Dict, Any, Optional
 
 from apify import Actor
 from parsera.parsera import Parsera
-from parsera.models import create_model_from_config
+from parsera.models import close_shared_http_client, create_model_from_config
 from parsera.utils import create_proxy_config
 
 # Configure logging
@@ -25,19 +25,23 @@ async def main():
         
         # Extract input parameters
         url = actor_input.get("url")
+        urls = actor_input.get("urls")
         elements = actor_input.get("elements", {})
         scrolls = actor_input.get("scrolls", 0)
+        wait_until = actor_input.get("waitUntil", "domcontentloaded")
+        wait_for_selector = actor_input.get("waitForSelector")
         llm_provider = actor_input.get("llmProvider", "openai")
         api_key = actor_input.get("apiKey")
         model_name = actor_input.get("modelName")
         proxy_configuration = actor_input.get("proxyConfiguration")
+        use_batch_api = actor_input.get("useBatchApi", False)
         
         # Log input parameters (excluding sensitive data)
-        logger.info(f"Starting Parsera extraction for URL: {url}")
-        
+        logger.info(f"Starting Parsera extraction for URL(s): {urls or url}")
+
         # Validate required parameters
-        if not url:
-            raise ValueError("URL is required")
+        if not url and not urls:
+            raise ValueError("Either 'url' or 'urls' is required")
             
         # Create proxy configuration
         proxy_settings = create_proxy_config(proxy_configuration)
@@ -57,23 +61,47 @@ async def main():
             raise
         
         # Create Parsera instance
-        parsera = Parsera(model=model)
+        parsera = Parsera(model=model, batch_mode=use_batch_api)
         
         # Run extraction
         try:
             logger.info("Running extraction...")
-            result = await parsera.arun(
-                url=url,
-                elements=elements,
-                proxy_settings=proxy_settings,
-                scrolls_limit=scrolls,
-            )
-            
+            if urls:
+                # Fan out over all URLs concurrently instead of looping
+                results = await parsera.arun_many(
+                    urls=urls,
+                    elements=elements,
+                    proxy_settings=proxy_settings,
+                    scrolls_limit=scrolls,
+                    wait_until=wait_until,
+                    wait_for_selector=wait_for_selector,
+                )
+                # Flatten per-URL result lists into one dataset push
+                result = [item for url_result in results for item in url_result]
+            else:
+                result = await parsera.arun(
+                    url=url,
+                    elements=elements,
+                    proxy_settings=proxy_settings,
+                    scrolls_limit=scrolls,
+                    wait_until=wait_until,
+                    wait_for_selector=wait_for_selector,
+                )
+
+            # In batch mode the run calls only queued prompts; submit the
+            # batch job now and add its results to whatever was produced
+            # inline (CSS fast-path rows, cache hits, fetch errors)
+            if use_batch_api:
+                batch_results = await parsera.flush_batch()
+                result.extend(item for items in batch_results.values() for item in items)
+
             # Push data to dataset
             await Actor.push_data(result)
             
-            # Close resources
+            # Close resources; the actor owns the whole process, so also
+            # tear down the process-wide HTTP client
             await parsera.close()
+            await close_shared_http_client()
             
         except Exception as e:
             logger.error(f"Extraction failed: {str(e)}")
@@ -4,6 +4,8 @@ Parsera models module - Handles LLM model creation and configuration
 """
 
 from typing import Optional
+
+import httpx
 from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -25,6 +27,33 @@ class ModelNotAvailableError(Exception):
     pass
 
 
+# Shared async HTTP client so concurrent LLM calls reuse pooled connections
+# (multiplexed over HTTP/2 when the h2 package is installed) instead of
+# paying a TCP/TLS handshake per request
+_SHARED_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """Get the process-wide async HTTP client, creating it on first use."""
+    global _SHARED_HTTP_CLIENT
+    if _SHARED_HTTP_CLIENT is None or _SHARED_HTTP_CLIENT.is_closed:
+        limits = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+        try:
+            _SHARED_HTTP_CLIENT = httpx.AsyncClient(http2=True, timeout=60, limits=limits)
+        except ImportError:
+            # http2 support needs the optional h2 package
+            _SHARED_HTTP_CLIENT = httpx.AsyncClient(timeout=60, limits=limits)
+    return _SHARED_HTTP_CLIENT
+
+
+async def close_shared_http_client():
+    """Close the shared HTTP client if one was created."""
+    global _SHARED_HTTP_CLIENT
+    if _SHARED_HTTP_CLIENT is not None and not _SHARED_HTTP_CLIENT.is_closed:
+        await _SHARED_HTTP_CLIENT.aclose()
+    _SHARED_HTTP_CLIENT = None
+
+
 def create_model_from_config(
     provider: str = DEFAULT_MODEL_PROVIDER,
     model_name: str = DEFAULT_MODEL_NAME,
@@ -50,10 +79,16 @@ def create_model_from_config(
     
     if provider == "openai":
         # Use API key from config or environment variable
+        http_client = get_shared_http_client()
         if api_key:
-            return ChatOpenAI(model_name=model_name, openai_api_key=api_key, **kwargs)
+            return ChatOpenAI(
+                model_name=model_name,
+                openai_api_key=api_key,
+                http_async_client=http_client,
+                **kwargs,
+            )
         else:
-            return ChatOpenAI(model_name=model_name, **kwargs)
+            return ChatOpenAI(model_name=model_name, http_async_client=http_client, **kwargs)
             
     elif provider == "anthropic":
         if not api_key:
@@ -83,4 +118,4 @@ def create_model_from_config(
 # Default model implementation for standalone use
 def get_default_model() -> BaseChatModel:
     """Get the default LLM model for extraction."""
-    return ChatOpenAI(model_name=DEFAULT_MODEL_NAME)
+    return ChatOpenAI(model_name=DEFAULT_MODEL_NAME, http_async_client=get_shared_http_client())
@@ -9,22 +9,45 @@ from typing import Optional, Callable, Awaitable, Dict, Any
 from playwright.async_api import async_playwright, Page, Browser, BrowserContext
 from playwright_stealth import stealth_async
 
+# Resource types the LLM never sees; blocking them typically cuts page
+# bandwidth 5-10x and load time 2-4x
+DEFAULT_BLOCKED_RESOURCES = ("image", "font", "media", "stylesheet")
+
 
 class PageLoader:
     """
     Handles browser automation and page content extraction using Playwright.
     """
-    
-    def __init__(self, custom_cookies: Optional[list[dict]] = None):
+
+    __slots__ = (
+        "browser",
+        "context",
+        "custom_cookies",
+        "block_resources",
+        "playwright",
+        "initial_script",
+        "stealth_mode",
+        "_pending_closes",
+    )
+
+    def __init__(
+        self,
+        custom_cookies: Optional[list[dict]] = None,
+        block_resources: Optional[tuple] = DEFAULT_BLOCKED_RESOURCES,
+    ):
         """
         Initialize the PageLoader.
-        
+
         Args:
             custom_cookies: Optional list of custom cookies to add to the browser context
+            block_resources: Resource types to abort instead of downloading.
+                Pass None or an empty tuple to download everything.
         """
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.custom_cookies = custom_cookies or []
+        self.block_resources = frozenset(block_resources or ())
+        self._pending_closes: set = set()
         
     async def create_session(
         self,
@@ -56,11 +79,22 @@ class PageLoader:
         
         # Create browser context
         self.context = await self.browser.new_context()
-        
-        # Add custom cookies if provided
+
+        # Abort requests for resources the extraction never uses
+        if self.block_resources:
+            blocked = self.block_resources
+
+            async def _route_handler(route):
+                if route.request.resource_type in blocked:
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await self.context.route("**/*", _route_handler)
+
+        # Add custom cookies in one round-trip to the browser process
         if self.custom_cookies:
-            for cookie in self.custom_cookies:
-                await self.context.add_cookies([cookie])
+            await self.context.add_cookies(self.custom_cookies)
                 
         # Store the initial script for future use
         self.initial_script = playwright_script
@@ -70,31 +104,46 @@ class PageLoader:
         self,
         url: str,
         scrolls_limit: int = 0,
-        playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None
+        playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
+        max_content_length: Optional[int] = None,
     ) -> str:
         """
         Fetch and process a web page.
-        
+
         Args:
             url: URL to fetch
             scrolls_limit: Number of times to scroll the page
             playwright_script: Optional script to run on the page
-            
+            wait_until: Playwright load state to wait for. The default
+                "domcontentloaded" avoids the long idle waits "networkidle"
+                incurs on ad-heavy pages.
+            wait_for_selector: Optional CSS selector to wait for after
+                navigation, for pages that render content late
+            max_content_length: When set, slice the HTML to this many
+                characters inside the browser, so multi-MB pages never
+                cross the CDP bridge into Python
+
         Returns:
             HTML content of the page
         """
         if not self.context:
             await self.create_session()
-            
+
         # Create a new page
         page = await self.context.new_page()
-        
+
         # Apply stealth mode if enabled
         if self.stealth_mode:
             await stealth_async(page)
-            
+
         # Navigate to the URL
-        await page.goto(url, wait_until="networkidle")
+        await page.goto(url, wait_until=wait_until)
+
+        # Wait for a specific element if the caller knows what to expect
+        if wait_for_selector:
+            await page.wait_for_selector(wait_for_selector, timeout=30000)
         
         # Run initial script if provided
         if self.initial_script:
@@ -104,21 +153,91 @@ class PageLoader:
         if playwright_script:
             await playwright_script(page)
             
-        # Scroll the page if requested
+        # Scroll the page if requested, waiting only until new content shows
+        # up instead of sleeping a fixed second per scroll
         for _ in range(scrolls_limit):
+            prev_height = await page.evaluate("document.body.scrollHeight")
             await page.evaluate("window.scrollBy(0, window.innerHeight)")
-            await page.wait_for_timeout(1000)  # Wait for 1 second after each scroll
+            try:
+                await page.wait_for_function(
+                    "(h) => document.body.scrollHeight > h",
+                    arg=prev_height,
+                    timeout=2000,
+                )
+            except Exception:
+                # Page height didn't grow (end of content or static page);
+                # give late renders a brief window and carry on
+                await page.wait_for_timeout(100)
             
-        # Get the page content
-        content = await page.content()
-        
-        # Close the page
-        await page.close()
-        
+        # Get the page content; a capped fetch slices in V8 so only the
+        # truncated string is serialized over the protocol
+        if max_content_length is not None:
+            content = await page.evaluate(
+                "(n) => document.documentElement.outerHTML.slice(0, n)",
+                max_content_length,
+            )
+        else:
+            content = await page.content()
+
+        # Close the page in the background; the content is already in hand,
+        # so there is no need to block on the close IPC
+        close_task = asyncio.create_task(page.close())
+        self._pending_closes.add(close_task)
+        close_task.add_done_callback(self._pending_closes.discard)
+
         return content
         
+    async def fetch_pages(
+        self,
+        urls: list[str],
+        scrolls_limit: int = 0,
+        playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
+        concurrency: int = 8,
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
+        max_content_length: Optional[int] = None,
+    ) -> list[str]:
+        """
+        Fetch multiple pages concurrently within one browser context.
+
+        Each worker opens its own page on the shared context, so network idle
+        waits overlap instead of accumulating. Playwright contexts are
+        async-safe for concurrent pages.
+
+        Args:
+            urls: URLs to fetch
+            scrolls_limit: Number of times to scroll each page
+            playwright_script: Optional script to run on each page
+            concurrency: Maximum number of pages fetched at once
+            wait_until: Playwright load state to wait for on each page
+            wait_for_selector: Optional CSS selector to wait for after navigation
+            max_content_length: Optional in-browser cap on each page's HTML
+
+        Returns:
+            List of HTML contents, in the same order as urls
+        """
+        if not self.context:
+            await self.create_session()
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _fetch(url: str) -> str:
+            async with semaphore:
+                return await self.fetch_page(
+                    url=url,
+                    scrolls_limit=scrolls_limit,
+                    playwright_script=playwright_script,
+                    wait_until=wait_until,
+                    wait_for_selector=wait_for_selector,
+                    max_content_length=max_content_length,
+                )
+
+        return await asyncio.gather(*(_fetch(url) for url in urls))
+
     async def close(self):
         """Close the browser and Playwright instance."""
+        if self._pending_closes:
+            await asyncio.gather(*self._pending_closes, return_exceptions=True)
         if self.context:
             await self.context.close()
         if self.browser:
@@ -129,7 +248,38 @@ class PageLoader:
     async def __aenter__(self):
         """Context manager entry."""
         return self
-        
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         await self.close()
+
+
+# Process-wide loader so repeated runs in one process reuse the browser
+# instead of paying Chromium startup (~1-2s) every time
+_SHARED_LOADER: Optional[PageLoader] = None
+
+
+def get_shared_loader(
+    custom_cookies: Optional[list[dict]] = None,
+    block_resources: Optional[tuple] = DEFAULT_BLOCKED_RESOURCES,
+) -> PageLoader:
+    """
+    Get the process-wide shared PageLoader, creating it on first use.
+
+    Cookies and resource blocking only take effect on the call that creates
+    the loader; later callers get the existing instance as-is.
+
+    Args:
+        custom_cookies: Optional list of custom cookies for the new loader
+        block_resources: Resource types to block for the new loader
+
+    Returns:
+        The shared PageLoader instance
+    """
+    global _SHARED_LOADER
+    if _SHARED_LOADER is None:
+        _SHARED_LOADER = PageLoader(
+            custom_cookies=custom_cookies,
+            block_resources=block_resources,
+        )
+    return _SHARED_LOADER
@@ -4,52 +4,162 @@ Parsera main module - Core extraction functionality
 """
 
 import asyncio
+import json
 import logging
 from typing import Dict, Any, Optional, Callable, Awaitable
 
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
 from playwright.async_api import Page
 
-from parsera.models import get_default_model
-from parsera.page import PageLoader
-from parsera.utils import format_extraction_prompt, parse_llm_response
+# Try to import optional dependencies
+try:
+    import tenacity
+    TENACITY_AVAILABLE = True
+except ImportError:
+    TENACITY_AVAILABLE = False
+
+from parsera.models import (
+    DEFAULT_MODEL_NAME,
+    ModelNotAvailableError,
+    get_default_model,
+)
+from parsera.page import PageLoader, get_shared_loader
+from parsera.utils import (
+    ResponseCache,
+    StreamingJSONArrayParser,
+    clean_html,
+    format_batch_extraction_prompt,
+    extract_with_css,
+    format_extraction_messages,
+    parse_llm_response,
+    split_batch_response,
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+def _collect_retryable_errors() -> tuple:
+    """Collect transient error types from whichever provider SDKs are installed."""
+    errors = []
+    try:
+        import openai
+        errors += [openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError]
+    except ImportError:
+        pass
+    try:
+        import anthropic
+        errors += [anthropic.RateLimitError, anthropic.APITimeoutError, anthropic.APIStatusError]
+    except ImportError:
+        pass
+    return tuple(errors)
+
+
+_RETRYABLE_LLM_ERRORS = _collect_retryable_errors()
+
+if TENACITY_AVAILABLE and _RETRYABLE_LLM_ERRORS:
+    # Jittered exponential backoff turns transient rate-limit/5xx failures
+    # into slightly slower successes instead of killing the extraction
+    _llm_retry = tenacity.retry(
+        wait=tenacity.wait_random_exponential(min=1, max=30),
+        stop=tenacity.stop_after_attempt(6),
+        retry=tenacity.retry_if_exception_type(_RETRYABLE_LLM_ERRORS),
+        reraise=True,
+    )
+else:
+    def _llm_retry(func):
+        return func
+
+
 class Parsera:
     """
     Main Parsera class for web scraping with LLMs.
     """
-    
+
+    __slots__ = (
+        "model",
+        "initial_script",
+        "stealth",
+        "loader",
+        "batch_mode",
+        "max_content_length",
+        "_llm_semaphore",
+        "_page_semaphore",
+        "_batch_requests",
+        "_response_cache",
+        "_owns_loader",
+    )
+
     def __init__(
         self,
         model: Optional[BaseChatModel] = None,
         initial_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
         stealth: bool = True,
         custom_cookies: Optional[list[dict]] = None,
+        max_concurrency: int = 50,
+        max_page_concurrency: int = 8,
+        reuse_browser: bool = False,
+        batch_mode: bool = False,
+        max_content_length: Optional[int] = None,
     ):
         """
         Initialize Parsera.
-        
+
         Args:
             model: LangChain Chat Model to use for extraction
             initial_script: Playwright script to execute before extraction
             stealth: Whether to use stealth mode for browser automation
             custom_cookies: List of custom cookies to add to the browser context
+            max_concurrency: Maximum number of concurrent LLM requests
+            max_page_concurrency: Maximum number of pages loading at once
+            reuse_browser: Use the process-wide shared browser instead of
+                launching a fresh one; close() then leaves it running
+            batch_mode: Queue prompts for the OpenAI Batch API (50% cost,
+                up to 24h turnaround) instead of invoking the model inline.
+                Run methods then return empty lists; call flush_batch() to
+                submit the job and collect results.
+            max_content_length: When set, cap each page's HTML inside the
+                browser before it reaches Python. Leave unset to let
+                clean_html shrink the full page instead - a blind byte cap
+                can cut off content the noise stripping would have kept.
         """
         # Use provided model or default
         self.model = model if model is not None else get_default_model()
-        
+
         # Store configuration
         self.initial_script = initial_script
         self.stealth = stealth
-        
+        self.max_content_length = max_content_length
+
+        # Limit concurrent LLM calls to respect provider rate limits
+        self._llm_semaphore = asyncio.Semaphore(max_concurrency)
+
+        # Limit simultaneously open pages so a large URL list doesn't
+        # thrash or OOM the browser container
+        self._page_semaphore = asyncio.Semaphore(max_page_concurrency)
+
+        # Prompts queued for the Batch API as (custom_id, prompt) pairs
+        self.batch_mode = batch_mode
+        self._batch_requests: list[tuple[str, str]] = []
+
+        # Results keyed by (model, schema, content), so identical or
+        # near-duplicate pages don't re-invoke the LLM
+        self._response_cache = ResponseCache()
+
         # Initialize page loader
-        self.loader = PageLoader(custom_cookies=custom_cookies)
+        self._owns_loader = not reuse_browser
+        if reuse_browser:
+            self.loader = get_shared_loader(custom_cookies=custom_cookies)
+        else:
+            self.loader = PageLoader(custom_cookies=custom_cookies)
         
-    async def _run(
+    @_llm_retry
+    async def _invoke_with_retry(self, prompt: str):
+        """Invoke the model under the concurrency limit, retrying transient failures."""
+        async with self._llm_semaphore:
+            return await self.model.ainvoke(prompt)
+
+    async def _run_stream(
         self,
         url: str,
         elements: Optional[Dict[str, str]] = None,
@@ -57,10 +167,18 @@ class Parsera:
         proxy_settings: Optional[Dict[str, Any]] = None,
         scrolls_limit: int = 0,
         playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
-    ) -> list:
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
+    ):
         """
-        Internal method to run the extraction process.
-        
+        Internal async generator yielding extracted items as they arrive.
+
+        The LLM response is consumed via astream and parsed incrementally,
+        so the first items are available while the model is still emitting
+        tokens. If the incremental parser finds nothing (e.g. the model
+        returned a bare object), the buffered response goes through the
+        regular parse_llm_response fallback.
+
         Args:
             url: URL to scrape
             elements: Dictionary of elements to extract (field name -> description)
@@ -68,51 +186,171 @@ class Parsera:
             proxy_settings: Proxy configuration for browser
             scrolls_limit: Number of times to scroll the page
             playwright_script: Custom script to run on the page
-            
-        Returns:
-            List of extracted items
+            wait_until: Playwright load state to wait for
+            wait_for_selector: Optional CSS selector to wait for after navigation
+
+        Yields:
+            Extracted items, one at a time
         """
+        # Bind hot attributes to locals once; this generator runs per page
+        loader = self.loader
+        model = self.model
         try:
             # Initialize browser session if not already done
-            if self.loader.context is None:
+            if loader.context is None:
                 logger.info("Creating browser session")
-                await self.loader.create_session(
+                await loader.create_session(
                     proxy_settings=proxy_settings,
                     playwright_script=self.initial_script,
                     stealth=self.stealth,
                 )
-                
-            # Fetch page content
-            logger.info(f"Fetching page content from {url}")
-            content = await self.loader.fetch_page(
-                url=url,
-                scrolls_limit=scrolls_limit,
-                playwright_script=playwright_script,
-            )
-            
-            # Format extraction prompt
+
+            # Fetch page content, bounded so concurrent runs don't open
+            # more pages than the browser can handle
+            logger.info("Fetching page content from %s", url)
+            async with self._page_semaphore:
+                content = await loader.fetch_page(
+                    url=url,
+                    scrolls_limit=scrolls_limit,
+                    playwright_script=playwright_script,
+                    wait_until=wait_until,
+                    wait_for_selector=wait_for_selector,
+                    max_content_length=self.max_content_length,
+                )
+
+            # Degenerate inputs: nothing asked for, or an empty/error page -
+            # either way the LLM could only return an empty array at full cost
+            if not elements and not prompt:
+                logger.info("No elements or prompt provided, skipping LLM call")
+                return
+            if len(content.strip()) < 200:
+                logger.info("Page content too short to extract from, skipping LLM call")
+                return
+
+            # Fast path: schemas described entirely as "css:<selector>" run
+            # against the DOM directly, skipping the LLM call and its cost
+            css_results = extract_with_css(content, elements or {})
+            if css_results is not None:
+                logger.info("Extracted %d items via CSS fast path", len(css_results))
+                for item in css_results:
+                    yield item
+                return
+
+            # Strip scripts/styles/etc. so the LLM only sees real content
+            content = clean_html(content)
+
+            # Format extraction prompt as cache-aligned content blocks;
+            # Anthropic models get the explicit cache_control marker
             logger.info("Formatting extraction prompt")
-            extraction_prompt = format_extraction_prompt(
+            message_blocks = format_extraction_messages(
                 content=content,
                 elements=elements or {},
                 custom_prompt=prompt,
+                cache_static_prefix=type(model).__name__ == "ChatAnthropic",
             )
-            
-            # Get LLM response
-            logger.info("Sending request to LLM")
+            extraction_messages = [HumanMessage(content=message_blocks)]
+            # Flat text for the Batch API queue and the semantic cache tier
+            extraction_prompt = "".join(block["text"] for block in message_blocks)
+
+            # Return cached results for prompts we've already paid for
+            model_id = getattr(model, "model_name", None) or type(model).__name__
+            cache_key = ResponseCache.make_key(model_id, elements or {}, content)
+            cached = self._response_cache.get(cache_key, prompt_text=extraction_prompt)
+            if cached is not None:
+                logger.info("Prompt cache hit for %s, skipping LLM call", url)
+                for item in cached:
+                    yield item
+                return
+
+            # In batch mode, queue the prompt for flush_batch instead of
+            # invoking the model now
+            if self.batch_mode:
+                logger.info("Queueing prompt for Batch API: %s", url)
+                self._batch_requests.append((url, extraction_prompt))
+                return
+
+            # Stream LLM response, yielding items as they complete
+            logger.info("Streaming request to LLM")
+            parser = StreamingJSONArrayParser()
+            buffer = []
+            collected = []
+            emitted = 0
             try:
-                response = await self.model.ainvoke(extraction_prompt)
-                logger.info(f"Raw LLM response: {response.content}")
+                async with self._llm_semaphore:
+                    async for chunk in model.astream(extraction_messages):
+                        text = chunk.content
+                        if not text:
+                            continue
+                        buffer.append(text)
+                        for item in parser.feed(text):
+                            emitted += 1
+                            collected.append(item)
+                            yield item
             except Exception as e:
-                logger.error(f"LLM request failed: {str(e)}")
-                raise
-            
-            # Parse and return results
-            logger.info("Parsing LLM response")
-            return parse_llm_response(response.content)
+                # Retry transient failures, but only when no items have been
+                # yielded yet — a mid-stream restart would duplicate output
+                if emitted == 0 and isinstance(e, _RETRYABLE_LLM_ERRORS):
+                    logger.warning("Streaming request failed (%s), retrying", e)
+                    response = await self._invoke_with_retry(extraction_messages)
+                    buffer = [response.content]
+                else:
+                    logger.error("LLM request failed: %s", e)
+                    raise
+
+            # Fall back to a full parse when no array items were streamed
+            if emitted == 0:
+                logger.info("Parsing LLM response")
+                for item in parse_llm_response("".join(buffer)):
+                    collected.append(item)
+                    yield item
+
+            self._response_cache.put(cache_key, collected, prompt_text=extraction_prompt)
         except Exception as e:
-            logger.error(f"Extraction failed: {str(e)}")
+            logger.error("Extraction failed: %s", e)
             raise
+
+    async def _run(
+        self,
+        url: str,
+        elements: Optional[Dict[str, str]] = None,
+        prompt: str = "",
+        proxy_settings: Optional[Dict[str, Any]] = None,
+        scrolls_limit: int = 0,
+        playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
+    ) -> list:
+        """
+        Internal method to run the extraction process.
+
+        Thin wrapper collecting the items yielded by _run_stream.
+
+        Args:
+            url: URL to scrape
+            elements: Dictionary of elements to extract (field name -> description)
+            prompt: Custom prompt to use for extraction
+            proxy_settings: Proxy configuration for browser
+            scrolls_limit: Number of times to scroll the page
+            playwright_script: Custom script to run on the page
+            wait_until: Playwright load state to wait for
+            wait_for_selector: Optional CSS selector to wait for after navigation
+
+        Returns:
+            List of extracted items
+        """
+        return [
+            item
+            async for item in self._run_stream(
+                url=url,
+                elements=elements,
+                prompt=prompt,
+                proxy_settings=proxy_settings,
+                scrolls_limit=scrolls_limit,
+                playwright_script=playwright_script,
+                wait_until=wait_until,
+                wait_for_selector=wait_for_selector,
+            )
+        ]
         
     def run(
         self,
@@ -122,6 +360,8 @@ class Parsera:
         proxy_settings: Optional[Dict[str, Any]] = None,
         scrolls_limit: int = 0,
         playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
     ) -> list:
         """
         Run extraction synchronously.
@@ -145,6 +385,8 @@ class Parsera:
                 proxy_settings=proxy_settings,
                 scrolls_limit=scrolls_limit,
                 playwright_script=playwright_script,
+                wait_until=wait_until,
+                wait_for_selector=wait_for_selector,
             )
         )
         
@@ -156,6 +398,8 @@ class Parsera:
         proxy_settings: Optional[Dict[str, Any]] = None,
         scrolls_limit: int = 0,
         playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
     ) -> list:
         """
         Run extraction asynchronously.
@@ -178,9 +422,250 @@ class Parsera:
             proxy_settings=proxy_settings,
             scrolls_limit=scrolls_limit,
             playwright_script=playwright_script,
+            wait_until=wait_until,
+            wait_for_selector=wait_for_selector,
         )
-        
+
+    async def arun_many(
+        self,
+        urls: list[str],
+        elements: Optional[Dict[str, str]] = None,
+        prompt: str = "",
+        proxy_settings: Optional[Dict[str, Any]] = None,
+        scrolls_limit: int = 0,
+        playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
+    ) -> list:
+        """
+        Run extraction for multiple URLs concurrently.
+
+        Page fetches and LLM calls for all URLs overlap via asyncio.gather,
+        sharing a single browser session. LLM concurrency is bounded by the
+        semaphore configured via max_concurrency.
+
+        Args:
+            urls: List of URLs to scrape
+            elements: Dictionary of elements to extract (field name -> description)
+            prompt: Custom prompt to use for extraction
+            proxy_settings: Proxy configuration for browser
+            scrolls_limit: Number of times to scroll each page
+            playwright_script: Custom script to run on each page
+
+        Returns:
+            List with one result list per URL, in input order. Failed URLs
+            yield a single-item list containing the URL and error message.
+        """
+        # Create the browser session once up front so all tasks share it
+        if self.loader.context is None:
+            logger.info("Creating browser session")
+            await self.loader.create_session(
+                proxy_settings=proxy_settings,
+                playwright_script=self.initial_script,
+                stealth=self.stealth,
+            )
+
+        coros = [
+            self._run(
+                url=url,
+                elements=elements,
+                prompt=prompt,
+                proxy_settings=proxy_settings,
+                scrolls_limit=scrolls_limit,
+                playwright_script=playwright_script,
+                wait_until=wait_until,
+                wait_for_selector=wait_for_selector,
+            )
+            for url in urls
+        ]
+        results = await asyncio.gather(*coros, return_exceptions=True)
+
+        # Replace exceptions with error records so one failure doesn't
+        # discard the rest of the batch
+        output = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                logger.error("Extraction failed for %s: %s", url, result)
+                output.append([{"url": url, "error": str(result)}])
+            else:
+                output.append(result)
+        return output
+
+    async def arun_batched(
+        self,
+        urls: list[str],
+        elements: Optional[Dict[str, str]] = None,
+        prompt: str = "",
+        proxy_settings: Optional[Dict[str, Any]] = None,
+        scrolls_limit: int = 0,
+        playwright_script: Optional[Callable[[Page], Awaitable[Page]]] = None,
+        wait_until: str = "domcontentloaded",
+        wait_for_selector: Optional[str] = None,
+        batch_size: int = 8,
+    ) -> list:
+        """
+        Run extraction for multiple URLs, batching several pages per LLM call.
+
+        Unlike arun_many, which issues one LLM request per URL, this packs
+        batch_size pages into a single prompt and splits the response by doc
+        id. This amortizes network overhead and sidesteps per-minute request
+        rate limits at the cost of higher per-request latency, so keep
+        batch_size modest (4-8 works well).
+
+        Args:
+            urls: List of URLs to scrape
+            elements: Dictionary of elements to extract (field name -> description)
+            prompt: Custom prompt to use for extraction
+            proxy_settings: Proxy configuration for browser
+            scrolls_limit: Number of times to scroll each page
+            playwright_script: Custom script to run on each page
+            batch_size: Number of pages to pack into one LLM request
+
+        Returns:
+            List with one result list per URL, in input order
+        """
+        if self.loader.context is None:
+            logger.info("Creating browser session")
+            await self.loader.create_session(
+                proxy_settings=proxy_settings,
+                playwright_script=self.initial_script,
+                stealth=self.stealth,
+            )
+
+        async def _run_batch(batch_urls: list[str]) -> list:
+            # Fetch all pages in the batch concurrently, then issue a single LLM call
+            logger.info("Fetching %d pages", len(batch_urls))
+            pages = await self.loader.fetch_pages(
+                urls=batch_urls,
+                scrolls_limit=scrolls_limit,
+                playwright_script=playwright_script,
+                wait_until=wait_until,
+                wait_for_selector=wait_for_selector,
+                max_content_length=self.max_content_length,
+            )
+            contents = [(url, clean_html(page)) for url, page in zip(batch_urls, pages)]
+
+            extraction_prompt = format_batch_extraction_prompt(
+                contents=contents,
+                elements=elements or {},
+                custom_prompt=prompt,
+            )
+
+            logger.info("Sending batch of %d pages to LLM", len(batch_urls))
+            response = await self._invoke_with_retry(extraction_prompt)
+
+            items = parse_llm_response(response.content)
+            by_id = split_batch_response(items, expected_ids=batch_urls)
+            return [by_id[url] for url in batch_urls]
+
+        batches = [urls[i:i + batch_size] for i in range(0, len(urls), batch_size)]
+        batch_results = await asyncio.gather(
+            *(_run_batch(batch) for batch in batches),
+            return_exceptions=True,
+        )
+
+        output = []
+        for batch, result in zip(batches, batch_results):
+            if isinstance(result, BaseException):
+                logger.error("Batch extraction failed for %s: %s", batch, result)
+                output.extend([{"url": url, "error": str(result)}] for url in batch)
+            else:
+                output.extend(result)
+        return output
+
+    async def flush_batch(self, poll_interval: float = 30.0) -> Dict[str, list]:
+        """
+        Submit queued prompts to the OpenAI Batch API and collect results.
+
+        Uploads the buffered prompts as a JSONL batch file, polls until the
+        batch finishes, and parses each response line. Batch jobs are billed
+        at 50% of the synchronous rate with a 24h completion window, so this
+        suits overnight actor runs rather than interactive ones.
+
+        Args:
+            poll_interval: Seconds to wait between batch status polls
+
+        Returns:
+            Mapping of custom id (the URL) to its list of extracted items
+
+        Raises:
+            ModelNotAvailableError: If the openai package is not installed
+            RuntimeError: If the batch job does not complete successfully
+        """
+        if not self._batch_requests:
+            return {}
+
+        try:
+            import openai
+        except ImportError:
+            raise ModelNotAvailableError(
+                "Batch API support requires the openai package."
+            )
+
+        model_name = getattr(self.model, "model_name", None) or DEFAULT_MODEL_NAME
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model_name,
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            })
+            for custom_id, prompt in self._batch_requests
+        ]
+
+        # Reuse the model's credentials so keys supplied via actor input
+        # work; fall back to the OPENAI_API_KEY environment variable
+        api_key = getattr(self.model, "openai_api_key", None)
+        if api_key is not None:
+            client = openai.AsyncOpenAI(api_key=api_key.get_secret_value())
+        else:
+            client = openai.AsyncOpenAI()
+        logger.info("Submitting batch of %d prompts", len(lines))
+        batch_file = await client.files.create(
+            file=("parsera_batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            logger.info("Batch %s status: %s", batch.id, batch.status)
+            await asyncio.sleep(poll_interval)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} finished with status: {batch.status}")
+
+        output = await client.files.content(batch.output_file_id)
+        results: Dict[str, list] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            content = record["response"]["body"]["choices"][0]["message"]["content"]
+            results[record["custom_id"]] = parse_llm_response(content)
+
+        self._batch_requests.clear()
+        return results
+
     async def close(self):
-        """Close browser and resources."""
-        if hasattr(self, 'loader'):
+        """
+        Close resources owned by this instance.
+
+        The shared browser and the shared HTTP client are process-wide and
+        may be in use by other instances, so they are left running; close
+        them at process shutdown via close_shared_http_client().
+        """
+        if self._batch_requests:
+            logger.warning(
+                "Closing with %d unflushed batch prompts; call flush_batch() to submit them",
+                len(self._batch_requests),
+            )
+        if hasattr(self, 'loader') and self._owns_loader:
             await self.loader.close()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Parsera numba utils module - JIT-compiled HTML noise stripping
+
+Optional accelerator for clean_html's fallback path: a byte-level state
+machine compiled with numba that removes script/style/svg/iframe/noscript
+blocks, comments and link/meta tags in a single native pass, avoiding the
+per-character interpreter overhead of the pure-Python alternatives.
+"""
+
+import numpy as np
+from numba import njit
+
+# Tag names as byte arrays for the compiled scan
+_SCRIPT = np.frombuffer(b"script", dtype=np.uint8)
+_STYLE = np.frombuffer(b"style", dtype=np.uint8)
+_NOSCRIPT = np.frombuffer(b"noscript", dtype=np.uint8)
+_SVG = np.frombuffer(b"svg", dtype=np.uint8)
+_IFRAME = np.frombuffer(b"iframe", dtype=np.uint8)
+_LINK = np.frombuffer(b"link", dtype=np.uint8)
+_META = np.frombuffer(b"meta", dtype=np.uint8)
+
+
+@njit(cache=True)
+def _lower(c):
+    """Lowercase a single ASCII byte."""
+    if 65 <= c <= 90:
+        return c + 32
+    return c
+
+
+@njit(cache=True)
+def _tag_at(buf, i, name):
+    """Check whether buf[i] starts an opening tag with the given name."""
+    n = len(buf)
+    m = len(name)
+    if i + 1 + m > n:
+        return False
+    for k in range(m):
+        if _lower(buf[i + 1 + k]) != name[k]:
+            return False
+    if i + 1 + m < n:
+        c = buf[i + 1 + m]
+        # '>', '/', or whitespace must follow so "s" doesn't match "span"
+        return c == 62 or c == 47 or c == 32 or c == 9 or c == 10 or c == 13
+    return False
+
+
+@njit(cache=True)
+def _skip_block(buf, i, name):
+    """Return the index just past the closing </name...> tag."""
+    n = len(buf)
+    m = len(name)
+    j = i + 1
+    while j < n:
+        if buf[j] == 60 and j + 2 + m <= n and buf[j + 1] == 47:  # "</"
+            ok = True
+            for k in range(m):
+                if _lower(buf[j + 2 + k]) != name[k]:
+                    ok = False
+                    break
+            if ok:
+                e = j + 2 + m
+                while e < n and buf[e] != 62:
+                    e += 1
+                return e + 1
+        j += 1
+    return n
+
+
+@njit(cache=True)
+def _skip_comment(buf, i):
+    """Return the index just past the closing --> of a comment at buf[i]."""
+    n = len(buf)
+    j = i + 4
+    while j + 2 < n:
+        if buf[j] == 45 and buf[j + 1] == 45 and buf[j + 2] == 62:
+            return j + 3
+        j += 1
+    return n
+
+
+@njit(cache=True)
+def _strip_noise(buf):
+    """Single-pass state machine dropping noise blocks from an HTML byte array."""
+    n = len(buf)
+    out = np.empty(n, dtype=np.uint8)
+    o = 0
+    i = 0
+    while i < n:
+        c = buf[i]
+        if c == 60:  # '<'
+            # Comment
+            if i + 3 < n and buf[i + 1] == 33 and buf[i + 2] == 45 and buf[i + 3] == 45:
+                i = _skip_comment(buf, i)
+                continue
+            # Container tags whose entire content is noise
+            if _tag_at(buf, i, _SCRIPT):
+                i = _skip_block(buf, i, _SCRIPT)
+                continue
+            if _tag_at(buf, i, _STYLE):
+                i = _skip_block(buf, i, _STYLE)
+                continue
+            if _tag_at(buf, i, _NOSCRIPT):
+                i = _skip_block(buf, i, _NOSCRIPT)
+                continue
+            if _tag_at(buf, i, _SVG):
+                i = _skip_block(buf, i, _SVG)
+                continue
+            if _tag_at(buf, i, _IFRAME):
+                i = _skip_block(buf, i, _IFRAME)
+                continue
+            # Void tags with no useful content
+            if _tag_at(buf, i, _LINK) or _tag_at(buf, i, _META):
+                while i < n and buf[i] != 62:
+                    i += 1
+                i += 1
+                continue
+        out[o] = c
+        o += 1
+        i += 1
+    return out[:o]
+
+
+def strip_noise_tags(html: str) -> str:
+    """
+    Strip script/style/svg/iframe/noscript blocks, comments and link/meta
+    tags from HTML using the compiled scanner.
+
+    Args:
+        html: Raw HTML content
+
+    Returns:
+        HTML with noise blocks removed
+    """
+    buf = np.frombuffer(html.encode("utf-8"), dtype=np.uint8)
+    return bytes(_strip_noise(buf)).decode("utf-8", errors="ignore")